@@ -18,6 +18,7 @@ from sqlalchemy import (
     String,
     Table,
     UniqueConstraint,
+    bindparam,
     create_engine,
     select,
 )
@@ -205,6 +206,22 @@ class DBLogger:
                 )
             )
 
+    def close_positions(self, exits: list[tuple[int, Optional[float]]]) -> None:
+        """Close several positions in one executemany; all succeed or none do."""
+        if not exits:
+            return
+        exit_time = datetime.utcnow()
+        stmt = (
+            self.positions_table.update()
+            .where(self.positions_table.c.id == bindparam("_id"))
+            .values(status="closed", exit_price=bindparam("_exit_price"), exit_time=exit_time)
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                stmt,
+                [{"_id": position_id, "_exit_price": exit_price} for position_id, exit_price in exits],
+            )
+
     def log_balance(self, asset: str, balance: float) -> None:
         """Record a balance snapshot."""
         with self.engine.begin() as conn:
@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
-from sqlalchemy import Table
+from sqlalchemy import Table, select
 
 from core.logger import DBLogger
 
 # Configuration
 st.set_page_config(layout="wide", page_title="Trading Bot Dashboard")
 REFRESH_INTERVAL = 60  # seconds
+FG_HISTORY_DAYS = 30  # window of Fear & Greed history to chart
 
 # Connect to MySQL
 db_logger = DBLogger()
@@ -41,13 +43,17 @@ def get_portfolio_allocation():
 
 def get_cumulative_pnl():
     with engine.connect() as conn:
-        df = pd.read_sql("SELECT close_time, pnl FROM trades WHERE pnl IS NOT NULL ORDER BY close_time", conn)
+        df = pd.read_sql(
+            "SELECT close_time, pnl FROM trades WHERE pnl IS NOT NULL ORDER BY close_time",
+            conn,
+            parse_dates=['close_time'],
+        )
     if df.empty:
         return pd.DataFrame({'date': [], 'pnl': []})
-    df['close_time'] = pd.to_datetime(df['close_time'])
-    df = df.rename(columns={'close_time': 'date'})
-    df['cumulative_pnl'] = df['pnl'].cumsum()
-    return df[['date', 'cumulative_pnl']].rename(columns={'cumulative_pnl': 'pnl'})
+    return pd.DataFrame({
+        'date': df['close_time'].to_numpy(),
+        'pnl': np.cumsum(df['pnl'].to_numpy(dtype=np.float64)),
+    })
 
 def get_today_trades():
     today_str = datetime.utcnow().strftime('%Y-%m-%d')
@@ -55,16 +61,35 @@ def get_today_trades():
         df = pd.read_sql(f"SELECT * FROM trades WHERE DATE(close_time) = '{today_str}'", conn)
     return df
 
+@st.cache_data(ttl=300)
 def get_fear_greed_history():
-    with engine.connect() as conn:
-        df = pd.read_sql(
-            "SELECT timestamp, final_score FROM fear_greed_scores WHERE symbol = 'TOTAL' ORDER BY timestamp ASC", conn
+    since = datetime.utcnow() - timedelta(days=FG_HISTORY_DAYS)
+    query = (
+        select(fear_greed_table.c.timestamp, fear_greed_table.c.final_score)
+        .where(
+            fear_greed_table.c.symbol == 'TOTAL',
+            fear_greed_table.c.timestamp >= since,
         )
+        .order_by(fear_greed_table.c.timestamp)
+    )
+    with engine.connect() as conn:
+        df = pd.read_sql(query, conn)
     if df.empty:
         return pd.DataFrame()
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     return df
 
+@st.cache_data
+def get_sample_candles():
+    # Placeholder prices until real OHLC is wired in; built once, not per rerun
+    return pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=20),
+        'open': 45000 + np.random.randn(20) * 500,
+        'high': 45500 + np.random.randn(20) * 500,
+        'low': 44500 + np.random.randn(20) * 500,
+        'close': 45000 + np.random.randn(20) * 500,
+    })
+
 # Dashboard Layout
 def main():
     last_refresh = st.empty()
@@ -163,12 +188,13 @@ def main():
 
     # ?? Price Candlestick (optional mock still)
     st.subheader("Price Action (Sample Candlestick)")
+    candles = get_sample_candles()
     fig = go.Figure(data=[go.Candlestick(
-        x=pd.date_range(start='2023-01-01', periods=20),
-        open=pd.Series(45000 + np.random.randn(20) * 500),
-        high=pd.Series(45500 + np.random.randn(20) * 500),
-        low=pd.Series(44500 + np.random.randn(20) * 500),
-        close=pd.Series(45000 + np.random.randn(20) * 500)
+        x=candles['date'],
+        open=candles['open'],
+        high=candles['high'],
+        low=candles['low'],
+        close=candles['close']
     )])
     st.plotly_chart(fig, use_container_width=True)
 
@@ -5,6 +5,7 @@ import sys
 import time
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import wraps
 
@@ -16,6 +17,7 @@ from core.strategy import add_indicators, generate_signal
 from core.order_manager import OrderManager
 from core.logger import DBLogger, engine, positions_table
 from core.report import get_monthly_performance
+from utils.cache import cache_result
 from utils.pushover import notify
 
 from sentiment.core.scorer import get_fear_greed_score
@@ -61,12 +63,23 @@ def parse_timeframes(raw: str) -> dict[str, int]:
         try:
             mapping[symbol.strip()] = int(minutes)
         except ValueError:
-            logger.warning(f"Invalid timeframe entry '{entry}' in TIMEFRAMES; expected SYMBOL:MINUTES")
+            logger.warning("Invalid timeframe entry '%s' in TIMEFRAMES; expected SYMBOL:MINUTES", entry)
     return mapping
 
 
 SYMBOL_TIMEFRAMES = parse_timeframes(RAW_TIMEFRAMES)
 
+# Kraken prefixes these legacy base assets with "X" in balance keys
+KRAKEN_X_ASSETS = frozenset({"BTC", "ETH", "XRP", "LTC"})
+
+
+def kraken_asset_code(symbol: str) -> str:
+    base = symbol.split("/")[0]
+    return "X" + base if base in KRAKEN_X_ASSETS else base
+
+
+SYMBOL_ASSET_CODES = {symbol: kraken_asset_code(symbol) for symbol in SYMBOLS}
+
 print(f"\n=== Kraken Bot STARTING in {BOT_MODE.upper()} mode ===\n")
 
 # --- CLIENTS & MANAGERS -----------------------------------------------------------
@@ -92,7 +105,7 @@ def retry(max_retries=3, backoff=5):
                 try:
                     return fn(*args, **kwargs)
                 except Exception as e:
-                    logger.warning(f"{fn.__name__} failed ({attempt}/{max_retries}): {e}")
+                    logger.warning("%s failed (%d/%d): %s", fn.__name__, attempt, max_retries, e)
                     if attempt == max_retries:
                         raise
                     time.sleep(delay)
@@ -105,26 +118,26 @@ def sync_open_positions():
     """Load all open positions from DB into memory."""
     try:
         with engine.connect() as conn:
-            rows = conn.execute(
-                positions_table.select().where(positions_table.c.status == "open")
-            ).mappings().all()
-        for r in rows:
-            open_positions[r["symbol"]] = {
-                "id": r["id"],
-                "entry_price": float(r["entry_price"]),
-                "volume": float(r["volume"]),
-                "trailing_stop": float(r["entry_price"])
-            }
-        print(f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')}] Synced {len(open_positions)} open positions")
+            df = pd.read_sql(
+                positions_table.select().where(positions_table.c.status == "open"), conn
+            )
+        df = df.astype({"entry_price": "float64", "volume": "float64"})
+        df["trailing_stop"] = df["entry_price"]
+        # Later rows win for duplicate symbols, as with the per-row inserts
+        df = df.drop_duplicates("symbol", keep="last")
+        open_positions.update(
+            df.set_index("symbol")[["id", "entry_price", "volume", "trailing_stop"]].to_dict("index")
+        )
+        logger.info("Synced %d open positions", len(open_positions))
     except Exception as e:
-        logger.error(f"Failed to sync open positions: {e}")
+        logger.error("Failed to sync open positions: %s", e)
 
 def sync_account_state():
     """Mirror Kraken open buy orders into DB and in-memory."""
     try:
         resp = api.query_private("OpenOrders")
         opens = resp.get("result", {}).get("open", {})
-        print(f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')}] Kraken has {len(opens)} open orders")
+        logger.info("Kraken has %d open orders", len(opens))
         for txid, order in opens.items():
             d = order["descr"]
             pair = d["pair"]
@@ -139,35 +152,40 @@ def sync_account_state():
                     "volume": vol,
                     "trailing_stop": price
                 }
-                logger.info(f"Synced BUY {pair} @ {price:.2f}, vol={vol:.6f}")
-        bal = api.query_private("Balance").get("result", {})
-        print(f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')}] Account Balances:")
-        for asset, amt in bal.items():
-            print(f"{asset}: {float(amt):.6f}")
+                logger.info("Synced BUY %s @ %.2f, vol=%.6f", pair, price, vol)
+        bal = get_balances()
+        if logger.isEnabledFor(logging.INFO):
+            balance_lines = "\n".join(f"{asset}: {float(amt):.6f}" for asset, amt in bal.items())
+            logger.info("Account Balances:\n%s", balance_lines)
     except Exception as e:
-        logger.error(f"Failed to sync account state: {e}")
+        logger.error("Failed to sync account state: %s", e)
 
 # --- HELPER ------------------------------------------------------------------------
-def get_available_capital(symbol: str, price: float) -> float:
+@cache_result(ttl_minutes=0.5)
+def get_balances() -> dict:
+    """Return Kraken account balances, reused for 30s across callers."""
+    return api.query_private("Balance").get("result", {})
+
+def get_available_capital(symbol: str, price: float, balances: dict) -> float:
     try:
-        resp = api.query_private("Balance")
         quote = symbol.split("/")[-1]
         asset = ("Z" + quote) if len(quote) == 3 else quote
-        bal = float(resp["result"].get(asset, 0))
+        bal = float(balances.get(asset, 0))
         usable = bal * (1 - FEE_RATE)
-        logger.debug(f"Balance {symbol}: {bal:.6f}, usable {usable:.6f}")
+        logger.debug("Balance %s: %.6f, usable %.6f", symbol, bal, usable)
         return usable / price if price > 0 else 0
     except Exception as e:
-        logger.error(f"Failed to get available capital for {symbol}: {e}")
+        logger.error("Failed to get available capital for %s: %s", symbol, e)
         return 0
 
 # --- MAIN TRADING CYCLE ------------------------------------------------------------
 @retry(max_retries=3, backoff=5)
 def execute_trading_cycle():
     try:
-        fear_greed_score = get_fear_greed_score()
+        balances = get_balances()
         emotionals = fetch_all_emotional_factors()
-        print(f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')}] Fear & Greed Score: {fear_greed_score:.2f}")
+        fear_greed_score = get_fear_greed_score(raw_emotions=emotionals)
+        logger.info("Fear & Greed Score: %.2f", fear_greed_score)
 
         log_emotional_snapshot(
             timestamp=datetime.utcnow(),
@@ -178,33 +196,42 @@ def execute_trading_cycle():
         )
 
         # --- Remove Phantom Positions ---
-        balances = api.query_private("Balance").get("result", {})
         positions = db_logger.get_open_positions()
         for pos in positions:
-            base = pos["symbol"].split("/")[0]
-            kraken_asset = "X" + base if base in ["BTC", "ETH", "XRP", "LTC"] else base
+            kraken_asset = SYMBOL_ASSET_CODES.get(pos["symbol"]) or kraken_asset_code(pos["symbol"])
             bal = float(balances.get(kraken_asset, 0))
             if bal < 0.00001:
-                logger.info(f"Removing phantom position: {pos['symbol']} (no balance in Kraken)")
+                logger.info("Removing phantom position: %s (no balance in Kraken)", pos["symbol"])
                 db_logger.close_position(pos["id"], exit_price=None)
         open_positions.clear()
         sync_open_positions()
 
         any_action = False
 
+        # Fetch every symbol's candles concurrently; the trading logic below
+        # still runs sequentially so position state needs no locking.
+        with ThreadPoolExecutor(max_workers=max(1, len(SYMBOLS))) as executor:
+            ohlc_futures = {
+                symbol: executor.submit(
+                    fetch_ohlc,
+                    symbol,
+                    interval=SYMBOL_TIMEFRAMES.get(symbol, DEFAULT_TIMEFRAME_MINUTES),
+                    lookback=60,
+                )
+                for symbol in SYMBOLS
+            }
+
         for symbol in SYMBOLS:
-            now = datetime.utcnow()
             trend_val = None
             try:
-                interval_minutes = SYMBOL_TIMEFRAMES.get(symbol, DEFAULT_TIMEFRAME_MINUTES)
-                df4 = fetch_ohlc(symbol, interval=interval_minutes, lookback=60)
+                df4 = ohlc_futures[symbol].result()
                 if df4.empty:
-                    logger.warning(f"No data for {symbol}")
+                    logger.warning("No data for %s", symbol)
                     continue
 
                 df4_ind = add_indicators(df4)
                 if df4_ind.empty:
-                    logger.warning(f"Indicator calculation failed for {symbol}")
+                    logger.warning("Indicator calculation failed for %s", symbol)
                     continue
 
                 last4 = df4_ind.iloc[-1]
@@ -221,10 +248,13 @@ def execute_trading_cycle():
                 )
 
                 signal = generate_signal(df4_ind, fear_greed_score)
-                rsi_print = f"{rsi:.2f}" if pd.notna(rsi) else "NaN"
-                st_print = f"{supertrend_val:.2f}" if pd.notna(supertrend_val) else "NaN"
-
-                print(f"[{now.strftime('%Y-%m-%d %H:%M:%S.%f')}] {symbol}  ?  Close: {price:.2f} | Supertrend: {st_print} | Trend: {trend4} | RSI: {rsi_print} | Signal: {signal or 'None'}")
+                if logger.isEnabledFor(logging.INFO):
+                    rsi_print = f"{rsi:.2f}" if pd.notna(rsi) else "NaN"
+                    st_print = f"{supertrend_val:.2f}" if pd.notna(supertrend_val) else "NaN"
+                    logger.info(
+                        "%s  ?  Close: %.2f | Supertrend: %s | Trend: %s | RSI: %s | Signal: %s",
+                        symbol, price, st_print, trend4, rsi_print, signal or "None",
+                    )
 
                 # --- Forced SELL (emotion crash override)
                 if symbol in open_positions and fear_greed_score < DANGER_FG_SCORE_FOR_EXIT:
@@ -232,7 +262,7 @@ def execute_trading_cycle():
                     exit_price = price
                     vol = info["volume"]
                     if DRY_RUN:
-                        logger.info(f"[DRY-RUN] FORCE EXIT {symbol} @ {exit_price:.2f}")
+                        logger.info("[DRY-RUN] FORCE EXIT %s @ %.2f", symbol, exit_price)
                     else:
                         order_mgr.place_limit_order(symbol, "sell", exit_price, vol)
                     db_logger.close_position(info["id"], exit_price)
@@ -248,7 +278,7 @@ def execute_trading_cycle():
                     exit_price = price
                     vol = info["volume"]
                     if DRY_RUN:
-                        logger.info(f"[DRY-RUN] SELL {symbol} @ {exit_price:.2f}")
+                        logger.info("[DRY-RUN] SELL %s @ %.2f", symbol, exit_price)
                     else:
                         order_mgr.place_limit_order(symbol, "sell", exit_price, vol)
                     db_logger.close_position(info["id"], exit_price)
@@ -267,13 +297,13 @@ def execute_trading_cycle():
                         entry_price = round(price + (ENTRY_BUFFER * atr),2)
                         # Fix: Round to 2 decimal places for ETH/USD
                         limit_price = round(current_price + 0.5 * atr, 2)
-                        volume = get_available_capital(symbol, entry_price)
+                        volume = get_available_capital(symbol, entry_price, balances)
                         if volume <= 0:
-                            logger.warning(f"Insufficient capital for {symbol}")
+                            logger.warning("Insufficient capital for %s", symbol)
                             continue
 
                         if DRY_RUN:
-                            logger.info(f"[DRY-RUN] BUY {symbol} (Flip) @ {entry_price:.2f}, vol={volume:.6f}")
+                            logger.info("[DRY-RUN] BUY %s (Flip) @ %.2f, vol=%.6f", symbol, entry_price, volume)
                         else:
                             order_mgr.place_limit_order(symbol, "buy", entry_price, volume)
 
@@ -288,9 +318,9 @@ def execute_trading_cycle():
                             notify("Trade Executed (Flip Entry)", f"{symbol} @ {entry_price:.2f}")
                         any_action = True
                     else:
-                        print(f"[{symbol}] Skipped buy - trend did not flip.")
+                        logger.info("[%s] Skipped buy - trend did not flip.", symbol)
             except Exception as e:
-                logger.error(f"Trading cycle failed for {symbol}: {e}")
+                logger.error("Trading cycle failed for %s: %s", symbol, e)
             finally:
                 if "trend_val" in locals():
                     last_trends[symbol] = trend_val
@@ -299,7 +329,7 @@ def execute_trading_cycle():
             logger.info("No trading actions taken in this cycle.")
 
     except Exception as e:
-        logger.error(f"Trading cycle failed: {e}")
+        logger.error("Trading cycle failed: %s", e)
         if not DRY_RUN:
             notify("Bot Crash", "See logs for details")
         raise
@@ -316,11 +346,11 @@ def run_monthly_report():
             f"Avg Hold: {stats['avg_holding_time']}"
         )
         if DRY_RUN:
-            logger.info(f"[DRY-RUN] Monthly Report:\n{msg}")
+            logger.info("[DRY-RUN] Monthly Report:\n%s", msg)
         else:
             notify("Monthly Report", msg)
     except Exception as e:
-        logger.error(f"Monthly report failed: {e}")
+        logger.error("Monthly report failed: %s", e)
 
 # --- ENTRY POINT ------------------------------------------------------------------
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+ALTER TABLE `fear_greed_scores`
+  ADD INDEX `idx_fgs_symbol_timestamp` (`symbol`, `timestamp`);
@@ -1,9 +1,13 @@
 # sentiment/core/fetcher.py
 
+import functools
 import os
+import numpy as np
 import requests
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from utils.retry import retry
 from utils.cache import cache_result
 
@@ -11,6 +15,11 @@ KRAKEN_API_URL = "https://api.kraken.com/0/public/OHLC"
 CMC_API_URL = "https://pro-api.coinmarketcap.com/v1/global-metrics/quotes/latest"
 CMC_API_KEY = os.getenv("CMC_API_KEY")
 
+# Shared session so repeated calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
+SESSION.headers.update({"Accepts": "application/json", "Connection": "keep-alive"})
+
 # Retry decorator will automatically retry failed calls
 @retry(times=3, backoff=5)
 @cache_result(ttl_minutes=5)
@@ -19,35 +28,34 @@ def fetch_kraken_ohlcv(pair, interval=240):
         "pair": pair.replace("/", ""),  # Kraken uses no slash in symbol
         "interval": interval
     }
-    response = requests.get(KRAKEN_API_URL, params=params)
+    response = SESSION.get(KRAKEN_API_URL, params=params)
     response.raise_for_status()
     data = response.json()
 
     if 'error' in data and data['error']:
         raise Exception(f"Kraken API error: {data['error']}")
 
-    # Kraken returns results under pair name key
+    # Kraken returns results under pair name key as
+    # [time, open, high, low, close, vwap, volume, count] rows of strings;
+    # parse them once into one contiguous array per column
     results = list(data['result'].values())[0]
-    ohlc_data = []
-    for candle in results:
-        ohlc_data.append({
-            "timestamp": int(candle[0]),
-            "open": float(candle[1]),
-            "high": float(candle[2]),
-            "low": float(candle[3]),
-            "close": float(candle[4]),
-            "volume": float(candle[6])
-        })
-    return ohlc_data
+    candles = np.array([candle[:7] for candle in results], dtype=np.float64).reshape(-1, 7)
+    return {
+        "timestamp": candles[:, 0].astype(np.int64),
+        "open": np.ascontiguousarray(candles[:, 1]),
+        "high": np.ascontiguousarray(candles[:, 2]),
+        "low": np.ascontiguousarray(candles[:, 3]),
+        "close": np.ascontiguousarray(candles[:, 4]),
+        "volume": np.ascontiguousarray(candles[:, 6]),
+    }
 
 @retry(times=3, backoff=10)
 @cache_result(ttl_minutes=15)
 def fetch_cmc_global_data1111111111111():
     headers = {
-        "Accepts": "application/json",
         "X-CMC_PRO_API_KEY": CMC_API_KEY,
     }
-    response = requests.get(CMC_API_URL, headers=headers)
+    response = SESSION.get(CMC_API_URL, headers=headers)
     response.raise_for_status()
     data = response.json()
     if 'data' not in data:
@@ -69,14 +77,10 @@ def fetch_cmc_global_data():
     }
 
     headers = {
-        'Accepts': 'application/json',
         'X-CMC_PRO_API_KEY': os.getenv('CMC_API_KEY').strip()
     }
 
-    session = requests.Session()
-    session.headers.update(headers)
-
-    response = session.get(url, params=parameters)
+    response = SESSION.get(url, params=parameters, headers=headers)
     response.raise_for_status()
     data = response.json()
 
@@ -99,25 +103,39 @@ def fetch_cmc_global_data():
     }
 
 def fetch_all_data():
-    symbols = os.getenv("SYMBOLS", "BTC/USD,ETH/USD").split(",")
+    # Callers within the same minute (e.g. the scorer and the sentiment
+    # run) share one set of network fetches
+    return _fetch_all_data(os.getenv("SYMBOLS", "BTC/USD,ETH/USD"), int(time.time() // 60))
+
+@functools.lru_cache(maxsize=1)
+def _fetch_all_data(raw_symbols, time_bucket):
+    symbols = [symbol.strip() for symbol in raw_symbols.split(",")]
 
     market_data = {}
 
+    # Each fetch is an independent HTTP call, so run them side by side
+    results = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(fetch_kraken_ohlcv, symbol): symbol for symbol in symbols}
+        futures[executor.submit(fetch_cmc_global_data)] = "CMC"
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                if name == "CMC":
+                    logging.error(f"Failed to fetch CMC Global Data: {str(e)}")
+                else:
+                    logging.error(f"Failed to fetch Kraken OHLCV for {name}: {str(e)}")
+
     for symbol in symbols:
-        symbol = symbol.strip()
-        try:
-            ohlc_data = fetch_kraken_ohlcv(symbol)
+        if symbol in results:
             market_data[symbol] = {
-                "ohlc": ohlc_data
+                "ohlc": results[symbol]
             }
-        except Exception as e:
-            logging.error(f"Failed to fetch Kraken OHLCV for {symbol}: {str(e)}")
 
-    try:
-        cmc_data = fetch_cmc_global_data()
-        market_data["CMC"] = cmc_data
-    except Exception as e:
-        logging.error(f"Failed to fetch CMC Global Data: {str(e)}")
+    if "CMC" in results:
+        market_data["CMC"] = results["CMC"]
 
     return market_data
-
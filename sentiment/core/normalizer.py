@@ -1,5 +1,16 @@
 # sentiment/core/normalizer.py
 
+import numpy as np
+
+# (raw key, score key, min, max) for each per-symbol market factor
+FACTOR_BOUNDS = (
+    ("volatility_raw", "volatility_score", 0, 0.05),
+    ("momentum_raw", "momentum_score", -0.01, 0.01),
+    ("volume_raw", "volume_score", 0.8, 1.5),
+    ("marketcap_raw", "marketcap_score", 500000000000, 3000000000000),
+    ("btcdom_raw", "btcdom_score", 35, 70),
+)
+
 def normalize(value, min_val, max_val):
     if value is None:
         return 50
@@ -7,16 +18,22 @@ def normalize(value, min_val, max_val):
         return 50
     return max(0, min(100, (value - min_val) / (max_val - min_val) * 100))
 
+def normalize_array(values, min_val, max_val):
+    # Vectorised normalize(); missing values (None/NaN) score a neutral 50
+    values = np.asarray(values, dtype=np.float64)
+    if max_val == min_val:
+        return np.full(values.shape, 50.0)
+    scores = np.clip((values - min_val) * (100.0 / (max_val - min_val)), 0.0, 100.0)
+    return np.where(np.isnan(values), 50.0, scores)
+
 def normalize_factors(factors):
-    normalized = {}
-    for symbol, raw in factors.items():
-        normalized[symbol] = {
-            "volatility_score": normalize(raw["volatility_raw"], 0, 0.05),
-            "momentum_score": normalize(raw["momentum_raw"], -0.01, 0.01),
-            "volume_score": normalize(raw["volume_raw"], 0.8, 1.5),
-            "marketcap_score": normalize(raw["marketcap_raw"], 500000000000, 3000000000000),
-            "btcdom_score": normalize(raw["btcdom_raw"], 35, 70),
-        }
+    symbols = list(factors)
+    normalized = {symbol: {} for symbol in symbols}
+    for raw_key, score_key, min_val, max_val in FACTOR_BOUNDS:
+        raw = np.array([factors[symbol][raw_key] for symbol in symbols], dtype=np.float64)
+        scores = normalize_array(raw, min_val, max_val).tolist()
+        for symbol, score in zip(symbols, scores):
+            normalized[symbol][score_key] = score
     return normalized
 
 def normalize_funding_rate(value):
@@ -37,4 +54,3 @@ def normalize_emotional_factors(raw_factors):
         "long_short_score": normalize_long_short_ratio(raw_factors.get("long_short_ratio", 1)),
         "taker_volume_score": normalize_taker_volume_ratio(raw_factors.get("taker_volume_ratio", 1)),
     }
-
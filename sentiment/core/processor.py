@@ -1,32 +1,98 @@
 # sentiment/core/processor.py
 
-import pandas as pd
 import numpy as np
 
-def calculate_atr(ohlc_data, period=14):
-    df = pd.DataFrame(ohlc_data)
-    df['H-L'] = df['high'] - df['low']
-    df['H-C'] = abs(df['high'] - df['close'].shift())
-    df['L-C'] = abs(df['low'] - df['close'].shift())
-    df['TR'] = df[['H-L', 'H-C', 'L-C']].max(axis=1)
-    df['ATR'] = df['TR'].rolling(window=period).mean()
-    return df['ATR'].iloc[-1] / df['close'].iloc[-1]
-
-def calculate_macd_histogram(ohlc_data, fast=12, slow=26, signal=9):
-    df = pd.DataFrame(ohlc_data)
-    df['EMA_fast'] = df['close'].ewm(span=fast, adjust=False).mean()
-    df['EMA_slow'] = df['close'].ewm(span=slow, adjust=False).mean()
-    df['MACD'] = df['EMA_fast'] - df['EMA_slow']
-    df['Signal'] = df['MACD'].ewm(span=signal, adjust=False).mean()
-    df['Histogram'] = df['MACD'] - df['Signal']
-    return df['Histogram'].iloc[-1]
-
-def calculate_volume_ratio(ohlc_data, lookback=30):
-    df = pd.DataFrame(ohlc_data)
-    avg_volume = df['volume'].tail(lookback).mean()
-    current_volume = df['volume'].iloc[-1]
+OHLCV_COLUMNS = ("high", "low", "close", "volume")
+
+def _true_range(high, low, close):
+    # True range along the last (bar) axis; the first bar has no previous
+    # close, so it is just H-L
+    prev_close = np.roll(close, 1, axis=-1)
+    tr = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    tr[..., 0] = high[..., 0] - low[..., 0]
+    return tr
+
+def calculate_atr(high, low, close, period=14):
+    tr = _true_range(high, low, close)
+    if len(tr) < period:
+        return np.nan
+    return tr[-period:].mean() / close[-1]
+
+def calculate_macd_histogram(close, fast=12, slow=26, signal=9):
+    # One streaming pass of adjust=False EMAs seeded from the first close;
+    # only the final histogram value is needed, so no series are built
+    alpha_fast = 2 / (fast + 1)
+    alpha_slow = 2 / (slow + 1)
+    alpha_signal = 2 / (signal + 1)
+    prices = np.asarray(close, dtype=np.float64).tolist()
+    ema_fast = ema_slow = prices[0]
+    signal_line = 0.0
+    for price in prices[1:]:
+        ema_fast += alpha_fast * (price - ema_fast)
+        ema_slow += alpha_slow * (price - ema_slow)
+        signal_line += alpha_signal * ((ema_fast - ema_slow) - signal_line)
+    return ema_fast - ema_slow - signal_line
+
+def calculate_volume_ratio(volume, lookback=30):
+    avg_volume = volume[-lookback:].mean()
+    current_volume = volume[-1]
     return current_volume / avg_volume if avg_volume != 0 else 1
 
+def calculate_factors(ohlcv, atr_period=14, fast=12, slow=26, signal=9, volume_lookback=30):
+    """
+    Compute ATR, MACD histogram and volume ratio for a stack of symbols.
+
+    ``ohlcv`` has shape (symbols, bars, 4) with H/L/C/V in the last axis.
+    Returns three arrays with one value per symbol.
+    """
+    high, low, close, volume = (ohlcv[:, :, i] for i in range(4))
+    n_symbols, n_bars = close.shape
+
+    if n_bars >= atr_period:
+        tr = _true_range(high, low, close)
+        atr = tr[:, -atr_period:].mean(axis=1) / close[:, -1]
+    else:
+        atr = np.full(n_symbols, np.nan)
+
+    macd_hist = np.array([calculate_macd_histogram(row, fast, slow, signal) for row in close])
+
+    avg_volume = volume[:, -volume_lookback:].mean(axis=1)
+    volume_ratio = np.ones(n_symbols)
+    np.divide(volume[:, -1], avg_volume, out=volume_ratio, where=avg_volume != 0)
+
+    return atr, macd_hist, volume_ratio
+
+def ohlcv_array(ohlc):
+    """
+    Return a (bars, 4) H/L/C/V array from either the fetcher's column arrays
+    or a list of candle dicts.
+    """
+    if isinstance(ohlc, dict):
+        return np.column_stack([np.asarray(ohlc[column], dtype=np.float64) for column in OHLCV_COLUMNS])
+    bars = np.empty((len(ohlc), len(OHLCV_COLUMNS)))
+    for i, column in enumerate(OHLCV_COLUMNS):
+        bars[:, i] = np.fromiter((candle[column] for candle in ohlc), np.float64, len(ohlc))
+    return bars
+
+def stack_ohlcv(market_data):
+    """
+    Group symbols by bar count into (symbols, bars, 4) H/L/C/V arrays.
+
+    Returns a list of (symbols, ohlcv) pairs, usually a single group since
+    Kraken returns the same history length for every pair.
+    """
+    groups = {}
+    for symbol, data in market_data.items():
+        if symbol == "CMC":
+            continue
+        bars = ohlcv_array(data['ohlc'])
+        groups.setdefault(len(bars), []).append((symbol, bars))
+
+    return [
+        ([symbol for symbol, _ in members], np.stack([bars for _, bars in members]))
+        for members in groups.values()
+    ]
+
 def calculate_market_cap_change(current_marketcap, previous_marketcap):
     if previous_marketcap == 0:
         return 0
@@ -41,16 +107,22 @@ def process_all_factors(market_data):
     previous_cmc_data = market_data.get("CMC", {})
     current_cmc_data = market_data.get("CMC", {})
 
-    for symbol, data in market_data.items():
-        if symbol == "CMC":
-            continue
+    computed = {}
+    for symbols, ohlcv in stack_ohlcv(market_data):
+        atr, macd_hist, volume_ratio = calculate_factors(ohlcv)
+        for symbol, values in zip(symbols, zip(atr.tolist(), macd_hist.tolist(), volume_ratio.tolist())):
+            computed[symbol] = values
 
-        ohlc = data['ohlc']
+    # Keep the market_data symbol order regardless of how symbols were grouped
+    for symbol in market_data:
+        if symbol not in computed:
+            continue
+        volatility_raw, momentum_raw, volume_raw = computed[symbol]
 
         factors[symbol] = {
-            "volatility_raw": calculate_atr(ohlc),
-            "momentum_raw": calculate_macd_histogram(ohlc),
-            "volume_raw": calculate_volume_ratio(ohlc),
+            "volatility_raw": volatility_raw,
+            "momentum_raw": momentum_raw,
+            "volume_raw": volume_raw,
             "marketcap_raw": current_cmc_data.get('total_market_cap_usd', 0),
             "btcdom_raw": current_cmc_data.get('btc_dominance', 0)
         }
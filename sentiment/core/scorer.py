@@ -1,8 +1,28 @@
+import functools
 import os
 
-def get_fear_greed_score():
+import numpy as np
+
+# (score key, weight env var, default weight)
+FACTOR_WEIGHTS = (
+    ("volatility_score", "WEIGHT_VOLATILITY", 0.25),
+    ("momentum_score", "WEIGHT_MOMENTUM", 0.20),
+    ("volume_score", "WEIGHT_VOLUME_SURGE", 0.20),
+    ("marketcap_score", "WEIGHT_MARKET_CAP_TREND", 0.20),
+    ("btcdom_score", "WEIGHT_BTC_DOMINANCE", 0.15),
+)
+EMOTIONAL_WEIGHTS = (
+    ("funding_rate_score", "WEIGHT_FUNDING_RATE", 0.05),
+    ("long_short_score", "WEIGHT_LONG_SHORT_RATIO", 0.05),
+    ("taker_volume_score", "WEIGHT_TAKER_VOLUME_RATIO", 0.05),
+)
+
+def get_fear_greed_score(market_data=None, regime=None, raw_emotions=None):
     """
     Fetch live emotional factors, normalize them, adjust Fear & Greed based on market regime.
+
+    Callers that already hold the market data, regime or raw emotional
+    factors can pass them in to skip fetching them again.
     """
     from sentiment.core.social_fetcher import fetch_all_emotional_factors
     from sentiment.core.normalizer import normalize_emotional_factors
@@ -10,7 +30,8 @@ def get_fear_greed_score():
     from sentiment.core.fetcher import fetch_all_data
 
     # Fetch raw emotional data
-    raw_emotions = fetch_all_emotional_factors()
+    if raw_emotions is None:
+        raw_emotions = fetch_all_emotional_factors()
     normalized = normalize_emotional_factors(raw_emotions)
 
     funding_score = normalized.get('funding_rate_score', 50)
@@ -18,8 +39,10 @@ def get_fear_greed_score():
     taker_volume_score = normalized.get('taker_volume_score', 50)
 
     # Detect overall market regime (bullish / bearish / sideways)
-    market_data = fetch_all_data()
-    regime = detect_market_regime(market_data)
+    if regime is None:
+        if market_data is None:
+            market_data = fetch_all_data()
+        regime = detect_market_regime(market_data)
 
     # Base final score from emotions
     base_emotional_score = (
@@ -41,35 +64,56 @@ def get_fear_greed_score():
 
     return final_score
 
+@functools.lru_cache(maxsize=8)
+def _parse_weights(raw_weights):
+    return np.array([float(weight) for weight in raw_weights], dtype=np.float64)
+
+def load_weights(spec):
+    # Keyed on the raw env values, so weights are only re-parsed when they change
+    return _parse_weights(tuple(os.getenv(env_var, default) for _, env_var, default in spec))
+
+# Below this many symbols, the generated per-symbol scorer beats building
+# a matrix for the matmul
+SPECIALIZE_MAX_SYMBOLS = 16
+
+@functools.lru_cache(maxsize=8)
+def _weighted_sum(keys, weights):
+    """
+    Generate `_score(s)` returning `s[key] * w0 + ...` with the keys written in
+    and the weights bound as its globals, so no per-call loops remain.
+    """
+    # Weights go in the namespace rather than the source: repr(inf) or
+    # repr(nan) would not be valid names there
+    namespace = {f"w{i}": weight for i, weight in enumerate(weights)}
+    terms = " + ".join(f"s[{key!r}] * w{i}" for i, key in enumerate(keys))
+    exec(compile(f"def _score(s):\n    return {terms}\n", "<scorer>", "exec"), namespace)
+    return namespace["_score"]
+
+def _scorer(spec):
+    keys = tuple(key for key, _, _ in spec)
+    return _weighted_sum(keys, tuple(load_weights(spec).tolist()))
+
 def calculate_final_score(normalized_factors, regime, emotional_factors=None):
-    final_scores = {}
-    
-    weight_volatility = float(os.getenv("WEIGHT_VOLATILITY", 0.25))
-    weight_momentum = float(os.getenv("WEIGHT_MOMENTUM", 0.20))
-    weight_volume = float(os.getenv("WEIGHT_VOLUME_SURGE", 0.20))
-    weight_marketcap = float(os.getenv("WEIGHT_MARKET_CAP_TREND", 0.20))
-    weight_btcdom = float(os.getenv("WEIGHT_BTC_DOMINANCE", 0.15))
-
-    weight_funding = float(os.getenv("WEIGHT_FUNDING_RATE", 0.05))
-    weight_longshort = float(os.getenv("WEIGHT_LONG_SHORT_RATIO", 0.05))
-    weight_taker_volume = float(os.getenv("WEIGHT_TAKER_VOLUME_RATIO", 0.05))
-
-    for symbol, scores in normalized_factors.items():
-        final = (
-            scores["volatility_score"] * weight_volatility +
-            scores["momentum_score"] * weight_momentum +
-            scores["volume_score"] * weight_volume +
-            scores["marketcap_score"] * weight_marketcap +
-            scores["btcdom_score"] * weight_btcdom
-        )
-
-        if emotional_factors:
-            final += (
-                emotional_factors["funding_rate_score"] * weight_funding +
-                emotional_factors["long_short_score"] * weight_longshort +
-                emotional_factors["taker_volume_score"] * weight_taker_volume
-            )
-
-        final_scores[symbol] = final
-
-    return final_scores
+    if not normalized_factors:
+        return {}
+
+    emotional_bonus = _scorer(EMOTIONAL_WEIGHTS)(emotional_factors) if emotional_factors else 0.0
+
+    if len(normalized_factors) <= SPECIALIZE_MAX_SYMBOLS:
+        score = _scorer(FACTOR_WEIGHTS)
+        return {
+            symbol: score(factors) + emotional_bonus
+            for symbol, factors in normalized_factors.items()
+        }
+
+    symbols = list(normalized_factors)
+    keys = [key for key, _, _ in FACTOR_WEIGHTS]
+
+    scores = np.fromiter(
+        (normalized_factors[symbol][key] for symbol in symbols for key in keys),
+        dtype=np.float64,
+        count=len(symbols) * len(keys),
+    ).reshape(len(symbols), len(keys))
+    finals = scores @ load_weights(FACTOR_WEIGHTS) + emotional_bonus
+
+    return dict(zip(symbols, finals.tolist()))
@@ -1,12 +1,18 @@
 # sentiment/core/social_fetcher.py
 
+import functools
 import os
+import re
+import threading
+import numpy as np
 import requests
 import tweepy
 import praw
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from utils.retry import retry
-from utils.cache import cache_result
+from utils.cache import cache_result, disk_cache
 
 # Load ENV once at top
 BINANCE_FUNDING_RATE_URL = "https://fapi.binance.com/fapi/v1/fundingRate"
@@ -15,22 +21,78 @@ REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
 
+# Whole-word, case-insensitive keyword scan for Reddit posts; one alternation
+# tags each hit as bullish or bearish so every post is scanned only once
+BULLISH_KEYWORDS = ("buy", "bullish", "pump", "moon", "ath")
+BEARISH_KEYWORDS = ("sell", "bearish", "crash", "panic", "rekt")
+KEYWORD_PATTERN = re.compile(
+    r"\b(?:(?P<bullish>%s)|(?P<bearish>%s))\b" % ("|".join(BULLISH_KEYWORDS), "|".join(BEARISH_KEYWORDS)),
+    re.IGNORECASE,
+)
+
+def scan_keywords(text):
+    """
+    Return which sides (bullish/bearish) are mentioned in text, stopping
+    as soon as both have been seen.
+    """
+    found = set()
+    for match in KEYWORD_PATTERN.finditer(text):
+        found.add(match.lastgroup)
+        if len(found) == 2:
+            break
+    return found
+
+# Keep-alive session shared by every fetcher in this module
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+REQUEST_TIMEOUT = 5
+
+# (url, params) -> (ETag, parsed body) for conditional GETs
+_etags = {}
+_etags_lock = threading.Lock()
+
+def _get_json(url, params=None):
+    """
+    GET url and return its JSON body, sending If-None-Match when an ETag was
+    seen before and reusing the stored body on 304 Not Modified.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    with _etags_lock:
+        cached = _etags.get(key)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = _SESSION.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    response.raise_for_status()
+    data = response.json()
+
+    etag = response.headers.get("ETag")
+    if etag:
+        with _etags_lock:
+            _etags[key] = (etag, data)
+    return data
+
+def _mean(values, default):
+    # Average of a float array, or default when the endpoint returned nothing
+    return float(values.mean()) if values.size else default
+
 # --- FUNDING RATE FETCHER ---
 
+# Binance settles funding every 8h, so an hour-old average is still current;
+# the disk layer keeps it across restarts, the in-memory layer avoids reads
 @retry(times=3, backoff=5)
-@cache_result(ttl_minutes=5)
+@cache_result(ttl_minutes=60)
+@disk_cache(ttl_seconds=3600)
 def fetch_binance_funding_rate(symbol="BTCUSDT"):
     params = {
         "symbol": symbol,
         "limit": 5  # Get last few funding rates
     }
-    response = requests.get(BINANCE_FUNDING_RATE_URL, params=params)
-    response.raise_for_status()
-    data = response.json()
+    data = _get_json(BINANCE_FUNDING_RATE_URL, params)
 
-    funding_rates = [float(item['fundingRate']) for item in data]
-    avg_funding_rate = sum(funding_rates) / len(funding_rates) if funding_rates else 0
-    return avg_funding_rate
+    funding_rates = np.fromiter((float(item['fundingRate']) for item in data), np.float64, len(data))
+    return _mean(funding_rates, default=0.0)
 
 # --- GLOBAL LONG/SHORT RATIO ---
 @retry(times=3, backoff=5)
@@ -42,13 +104,10 @@ def fetch_binance_long_short_ratio(symbol="BTCUSDT"):
         "limit": 5
     }
     url = "https://fapi.binance.com/futures/data/globalLongShortAccountRatio"
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
+    data = _get_json(url, params)
 
-    ratios = [float(item['longShortRatio']) for item in data]
-    avg_ratio = sum(ratios) / len(ratios) if ratios else 1
-    return avg_ratio
+    ratios = np.fromiter((float(item['longShortRatio']) for item in data), np.float64, len(data))
+    return _mean(ratios, default=1.0)
 
 # --- TAKER BUY/SELL VOLUME RATIO ---
 @retry(times=3, backoff=5)
@@ -60,19 +119,12 @@ def fetch_binance_taker_volume_ratio(symbol="BTCUSDT"):
         "limit": 5
     }
     url = "https://fapi.binance.com/futures/data/takerlongshortRatio"
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
-
-    buy_sell_ratios = []
-    for item in data:
-        buy_vol = float(item.get('takerBuyVolume', 0))
-        sell_vol = float(item.get('takerSellVolume', 0))
-        if sell_vol > 0:
-            buy_sell_ratios.append(buy_vol / sell_vol)
+    data = _get_json(url, params)
 
-    avg_ratio = sum(buy_sell_ratios) / len(buy_sell_ratios) if buy_sell_ratios else 1
-    return avg_ratio
+    buy_vol = np.fromiter((float(item.get('takerBuyVolume', 0)) for item in data), np.float64, len(data))
+    sell_vol = np.fromiter((float(item.get('takerSellVolume', 0)) for item in data), np.float64, len(data))
+    traded = sell_vol > 0
+    return _mean(buy_vol[traded] / sell_vol[traded], default=1.0)
 
 # --- TWITTER KEYWORD VOLUME ---
 
@@ -96,7 +148,7 @@ def fetch_twitter_keyword_count(keyword="bitcoin"):
     }
 
     url = "https://api.twitter.com/2/tweets/counts/recent"
-    response = requests.get(url, headers=headers, params=query)
+    response = _SESSION.get(url, headers=headers, params=query, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     data = response.json()
 
@@ -105,32 +157,31 @@ def fetch_twitter_keyword_count(keyword="bitcoin"):
 
 # --- REDDIT SENTIMENT FETCHER ---
 
-@retry(times=3, backoff=5)
-@cache_result(ttl_minutes=5)
-def fetch_reddit_sentiment(subreddit_name="cryptocurrency"):
-    if not (REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET and REDDIT_USER_AGENT):
-        return 0
-
-    reddit = praw.Reddit(
+@functools.lru_cache(maxsize=1)
+def _reddit():
+    # One client per process; praw keeps the OAuth token between calls
+    return praw.Reddit(
         client_id=REDDIT_CLIENT_ID,
         client_secret=REDDIT_CLIENT_SECRET,
         user_agent=REDDIT_USER_AGENT
     )
 
-    posts = reddit.subreddit(subreddit_name).new(limit=50)
+@retry(times=3, backoff=5)
+@cache_result(ttl_minutes=5)
+def fetch_reddit_sentiment(subreddit_name="cryptocurrency"):
+    if not (REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET and REDDIT_USER_AGENT):
+        return 0
 
-    bullish_keywords = ["buy", "bullish", "pump", "moon", "ath"]
-    bearish_keywords = ["sell", "bearish", "crash", "panic", "rekt"]
+    posts = _reddit().subreddit(subreddit_name).new(limit=50)
 
     bullish_score = 0
     bearish_score = 0
 
     for post in posts:
-        text = (post.title + " " + post.selftext).lower()
-        if any(word in text for word in bullish_keywords):
-            bullish_score += 1
-        if any(word in text for word in bearish_keywords):
-            bearish_score += 1
+        text = post.title + " " + post.selftext
+        sides = scan_keywords(text)
+        bullish_score += "bullish" in sides
+        bearish_score += "bearish" in sides
 
     total = bullish_score + bearish_score
     if total == 0:
@@ -142,18 +193,19 @@ def fetch_reddit_sentiment(subreddit_name="cryptocurrency"):
 # --- MAIN FETCHER TO COMBINE ALL ---
 
 def fetch_all_emotional_factors():
-    results = {}
-
-    # Funding Rate
-    funding_rate = fetch_binance_funding_rate("BTCUSDT")
-    results['funding_rate'] = funding_rate
-
-    # Long/Short Ratio
-    long_short_ratio = fetch_binance_long_short_ratio("BTCUSDT")
-    results['long_short_ratio'] = long_short_ratio
-
-    # Taker Buy/Sell Volume Ratio
-    taker_volume_ratio = fetch_binance_taker_volume_ratio("BTCUSDT")
-    results['taker_volume_ratio'] = taker_volume_ratio
-
-    return results
+    # The three Binance endpoints are independent, so overlap their round-trips
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Funding Rate
+        funding_rate = executor.submit(fetch_binance_funding_rate, "BTCUSDT")
+
+        # Long/Short Ratio
+        long_short_ratio = executor.submit(fetch_binance_long_short_ratio, "BTCUSDT")
+
+        # Taker Buy/Sell Volume Ratio
+        taker_volume_ratio = executor.submit(fetch_binance_taker_volume_ratio, "BTCUSDT")
+
+        return {
+            'funding_rate': funding_rate.result(),
+            'long_short_ratio': long_short_ratio.result(),
+            'taker_volume_ratio': taker_volume_ratio.result(),
+        }
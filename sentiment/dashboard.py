@@ -1,38 +1,41 @@
 # sentiment/dashboard_streamlit.py
 
-import mysql.connector
+import functools
 import pandas as pd
 import os
 import streamlit as st
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
 from utils.env_loader import load_env
 from datetime import datetime, timedelta
 
-def load_data():
+QUERY = """
+SELECT symbol, timestamp, final_score
+FROM fear_greed_scores
+WHERE timestamp >= NOW() - INTERVAL 1 DAY
+ORDER BY timestamp ASC
+"""
+
+@functools.lru_cache(maxsize=1)
+def get_engine():
     load_env()
 
-    conn = mysql.connector.connect(
+    return create_engine(URL.create(
+        "mysql+mysqlconnector",
         host=os.getenv("MYSQL_HOST"),
-        user=os.getenv("MYSQL_USER"),
+        username=os.getenv("MYSQL_USER"),
         password=os.getenv("MYSQL_PASSWORD"),
         database=os.getenv("MYSQL_DB")
+    ))
+
+def load_data():
+    # Typed load: no per-row dicts, category symbols and float32 scores
+    return pd.read_sql_query(
+        QUERY,
+        get_engine(),
+        parse_dates=['timestamp'],
+        dtype={'symbol': 'category', 'final_score': 'float32'}
     )
-    cursor = conn.cursor(dictionary=True)
-
-    query = """
-    SELECT symbol, timestamp, final_score
-    FROM fear_greed_scores
-    WHERE timestamp >= NOW() - INTERVAL 1 DAY
-    ORDER BY timestamp ASC
-    """
-    cursor.execute(query)
-    results = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    if results:
-        return pd.DataFrame(results)
-    else:
-        return pd.DataFrame()
 
 def main():
     st.set_page_config(page_title="Crypto Sentiment Dashboard", layout="wide")
@@ -51,12 +54,12 @@ def main():
 
     st.markdown(f"#### Last Updated: {latest_timestamp} UTC ({last_update_minutes:.1f} min ago)")
 
-    # Current scores (latest only)
-    latest_data = data[data['timestamp'] == data['timestamp'].max()]
+    # Current scores (latest only), ranked once for the table and the top 3
+    latest_data = data[data['timestamp'] == latest_timestamp].sort_values('final_score', ascending=False)
 
     st.subheader("?? Current Fear & Greed Levels")
     st.dataframe(
-        latest_data[['symbol', 'final_score']].sort_values(by='final_score', ascending=False)
+        latest_data[['symbol', 'final_score']]
         .style
         .background_gradient(cmap='RdYlGn')
         .format({"final_score": "{:.2f}"})
@@ -64,12 +67,13 @@ def main():
 
     # Top 3 Coins
     st.subheader("?? Top 3 Coins by Sentiment")
-    top3 = latest_data.sort_values('final_score', ascending=False).head(3)
+    top3 = latest_data.head(3)
     for idx, row in top3.iterrows():
         st.metric(label=f"{row['symbol']}", value=f"{row['final_score']:.2f}")
 
     # Line Chart
     st.subheader("?? Sentiment Trend Over Last 24 Hours")
+    # Rows arrive ORDER BY timestamp, so the pivot index is already sorted
     chart_data = data.pivot(index='timestamp', columns='symbol', values='final_score')
     st.line_chart(chart_data)
 
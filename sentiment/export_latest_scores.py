@@ -1,42 +1,50 @@
 # sentiment/export_latest_scores.py
 
-import mysql.connector
-import pandas as pd
+import csv
 import os
-from datetime import datetime
+from utils.db import get_conn
 from utils.env_loader import load_env
 
+# One pass over the (symbol, timestamp) index instead of a correlated
+# MAX(timestamp) subquery per symbol. The server formats timestamp and score,
+# so the CSV writer only copies strings.
+QUERY = """
+SELECT symbol,
+       DATE_FORMAT(timestamp, '%Y-%m-%d %H:%i:%s') AS timestamp,
+       ROUND(final_score, 4) AS final_score
+FROM (
+    SELECT symbol, timestamp, final_score,
+           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn
+    FROM fear_greed_scores
+) latest
+WHERE rn = 1
+ORDER BY symbol ASC
+"""
+
 def export_latest_scores():
     load_env()
 
-    conn = mysql.connector.connect(
-        host=os.getenv("MYSQL_HOST"),
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database=os.getenv("MYSQL_DB")
-    )
-    cursor = conn.cursor(dictionary=True)
+    with get_conn() as conn:
+        cursor = conn.cursor()
 
-    query = """
-    SELECT symbol, timestamp, final_score
-    FROM fear_greed_scores
-    WHERE timestamp = (SELECT MAX(timestamp) FROM fear_greed_scores WHERE symbol = fgs.symbol)
-    ORDER BY symbol ASC
-    """
-    query = query.replace('fgs', 'fear_greed_scores')  # aliasing fix
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    cursor.close()
-    conn.close()
-
-    if results:
-        df = pd.DataFrame(results)
-        output_path = os.path.join(os.path.dirname(__file__), "logs", "latest_scores.csv")
-        df.to_csv(output_path, index=False)
-        print(f"[OK] Exported latest scores to {output_path}")
-    else:
-        print("[WARNING] No scores available to export.")
+        try:
+            cursor.execute(QUERY)
+            first_row = cursor.fetchone()
+
+            if first_row is None:
+                print("[WARNING] No scores available to export.")
+                return
+
+            # Stream rows from the cursor straight into the CSV
+            output_path = os.path.join(os.path.dirname(__file__), "logs", "latest_scores.csv")
+            with open(output_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow([column[0] for column in cursor.description])
+                writer.writerow(first_row)
+                writer.writerows(cursor)
+            print(f"[OK] Exported latest scores to {output_path}")
+        finally:
+            cursor.close()
 
 if __name__ == "__main__":
     export_latest_scores()
@@ -1,29 +1,23 @@
 # sentiment/healthcheck.py
 
-import mysql.connector
-import os
 from datetime import datetime, timedelta
+from utils.db import get_conn
 from utils.env_loader import load_env
 from utils.alerts import send_alert
 
 def check_recent_sentiment():
     load_env()
 
-    conn = mysql.connector.connect(
-        host=os.getenv("MYSQL_HOST"),
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database=os.getenv("MYSQL_DB")
-    )
-    cursor = conn.cursor()
-
-    query = """
-    SELECT MAX(timestamp) 
-    FROM fear_greed_scores
-    """
-    cursor.execute(query)
-    result = cursor.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+
+        query = """
+        SELECT MAX(timestamp) 
+        FROM fear_greed_scores
+        """
+        cursor.execute(query)
+        result = cursor.fetchone()
+        cursor.close()
 
     if result and result[0]:
         latest_timestamp = result[0]
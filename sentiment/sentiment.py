@@ -2,7 +2,9 @@
 
 import sys
 import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -14,7 +16,7 @@ import krakenex
 # Setup local imports
 from utils.env_loader import load_env
 from core.fetcher import fetch_all_data
-from core.processor import process_all_factors
+from core.processor import calculate_atr, process_all_factors
 from core.normalizer import normalize_factors
 from core.regime_detector import detect_market_regime
 from core.scorer import calculate_final_score
@@ -35,6 +37,15 @@ positions_table = db_logger.metadata.tables["positions"]
 
 DANGER_FG_SCORE_FOR_EXIT = int(os.getenv("DANGER_FG_SCORE_FOR_EXIT", "15"))
 
+def place_forced_exit(position_id, symbol, volume, exit_price):
+    try:
+        # Place sell limit order
+        order_mgr.place_limit_order(symbol, "sell", exit_price, volume)
+        return position_id, exit_price
+    except Exception as e:
+        print(f"Error placing forced exit for {symbol}: {str(e)}")
+        return None
+
 def main():
     try:
         # 1. Load environment variables
@@ -85,36 +96,36 @@ def main():
                 )
                 open_positions = pd.DataFrame(result.mappings().all())
 
+            # Fetch every symbol's candles at once rather than one round-trip
+            # per position; exit latency matters most during a crash
+            symbols = open_positions['symbol'].unique().tolist() if not open_positions.empty else []
+            with ThreadPoolExecutor(max_workers=max(1, len(symbols))) as executor:
+                ohlc_by_symbol = dict(zip(symbols, executor.map(lambda s: fetch_ohlc(s, interval=240), symbols)))  # 4h candles
+
+            exits = []
             for idx, pos in open_positions.iterrows():
                 symbol = pos['symbol']
                 volume = pos['volume']
 
-                # Fetch latest OHLC to calculate ATR
-                df = fetch_ohlc(symbol, interval=240)  # 4h candles
+                df = ohlc_by_symbol[symbol]
                 if df.empty:
                     print(f"Failed to fetch OHLC for {symbol}. Skipping...")
                     continue
 
-                # Calculate ATR
-                df['H-L'] = df['high'] - df['low']
-                df['H-C'] = abs(df['high'] - df['close'].shift())
-                df['L-C'] = abs(df['low'] - df['close'].shift())
-                df['TR'] = df[['H-L', 'H-C', 'L-C']].max(axis=1)
-                atr = df['TR'].rolling(window=14).mean().iloc[-1]
-
-                current_price = df['close'].iloc[-1]
+                # calculate_atr returns ATR as a fraction of the last close
+                high, low, close = (df[column].to_numpy(dtype=np.float64) for column in ("high", "low", "close"))
+                current_price = close[-1]
+                atr = calculate_atr(high, low, close, period=14) * current_price
                 exit_price = max(current_price - atr, 0.01)  # Avoid negative price
 
                 print(f"Placing LIMIT SELL for {symbol} @ {exit_price:.2f} (ATR buffer)")
+                exits.append((int(pos["id"]), symbol, volume, float(exit_price)))
 
-                try:
-                    # Place sell limit order
-                    order_mgr.place_limit_order(symbol, "sell", exit_price, volume)
+            with ThreadPoolExecutor(max_workers=max(1, len(exits))) as executor:
+                placed = [closed for closed in executor.map(lambda exit: place_forced_exit(*exit), exits) if closed]
 
-                    # Update DB
-                    db_logger.close_position(pos['id'], exit_price)
-                except Exception as e:
-                    print(f"Error placing forced exit for {symbol}: {str(e)}")
+            # Update DB: close every placed exit in a single transaction
+            db_logger.close_positions(placed)
 
     except Exception as e:
         send_alert(f"Sentiment Engine Critical Failure: {str(e)}", priority=1)
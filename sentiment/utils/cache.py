@@ -1,21 +1,82 @@
 # sentiment/utils/cache.py
 
 import functools
+import hashlib
+import os
+import pickle
+import threading
 import time
+from collections import OrderedDict
 
-_cache_store = {}
+# One LRU store per decorated function, all guarded by a single lock
+_cache_stores = []
+_cache_lock = threading.RLock()
 
-def cache_result(ttl_minutes=5):
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sentiment")
+
+def cache_result(ttl_minutes=5, maxsize=128):
+    """
+    Cache results in memory for ttl_minutes, keeping at most maxsize
+    entries per function (least recently used are evicted first).
+    """
+    def decorator_cache(func):
+        store = OrderedDict()
+        with _cache_lock:
+            _cache_stores.append(store)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(kwargs.items()))
+            with _cache_lock:
+                if key in store:
+                    cached_time, result = store[key]
+                    if time.time() - cached_time < ttl_minutes * 60:
+                        store.move_to_end(key)
+                        return result
+            # Computed outside the lock so slow calls don't block other keys
+            result = func(*args, **kwargs)
+            with _cache_lock:
+                store[key] = (time.time(), result)
+                store.move_to_end(key)
+                while len(store) > maxsize:
+                    store.popitem(last=False)
+            return result
+        return wrapper
+    return decorator_cache
+
+def clear():
+    """Drop every in-memory cache_result entry."""
+    with _cache_lock:
+        for store in _cache_stores:
+            store.clear()
+
+def disk_cache(ttl_seconds=3600):
+    """
+    Persist results as pickled (timestamp, value) files under CACHE_DIR so
+    they survive restarts. Files are rewritten atomically via os.replace.
+    """
     def decorator_cache(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            key = (func.__name__, args, tuple(kwargs.items()))
-            if key in _cache_store:
-                cached_time, result = _cache_store[key]
-                if time.time() - cached_time < ttl_minutes * 60:
+            digest = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()[:16]
+            path = os.path.join(CACHE_DIR, f"{func.__name__}_{digest}.pkl")
+            try:
+                with open(path, "rb") as f:
+                    cached_time, result = pickle.load(f)
+                if time.time() - cached_time < ttl_seconds:
                     return result
+            except Exception:
+                pass  # missing or unreadable cache file; fetch fresh
+
             result = func(*args, **kwargs)
-            _cache_store[key] = (time.time(), result)
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump((time.time(), result), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # caching is best effort
             return result
         return wrapper
     return decorator_cache
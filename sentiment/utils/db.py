@@ -0,0 +1,29 @@
+# sentiment/utils/db.py
+
+import functools
+import os
+from contextlib import contextmanager
+from mysql.connector.pooling import MySQLConnectionPool
+
+POOL_SIZE = 4
+
+@functools.lru_cache(maxsize=1)
+def get_pool():
+    # Built on first use so callers can load_env() beforehand
+    return MySQLConnectionPool(
+        pool_name="sent",
+        pool_size=POOL_SIZE,
+        host=os.getenv("MYSQL_HOST"),
+        user=os.getenv("MYSQL_USER"),
+        password=os.getenv("MYSQL_PASSWORD"),
+        database=os.getenv("MYSQL_DB")
+    )
+
+@contextmanager
+def get_conn():
+    # close() on a pooled connection hands it back to the pool
+    conn = get_pool().get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -6,3 +6,8 @@ import sys
 ROOT = os.path.dirname(os.path.dirname(__file__))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# Collecting ``sentiment/test_fetch_emotionals.py`` puts ``sentiment/`` on
+# sys.path, where ``sentiment.py`` would shadow the ``sentiment`` package.
+# Importing the package up front keeps ``sentiment.core`` resolvable.
+import sentiment.core  # noqa: E402,F401
@@ -0,0 +1,64 @@
+from utils import cache
+from utils.cache import disk_cache
+
+
+def test_disk_cache_reuses_persisted_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    calls = []
+
+    @disk_cache(ttl_seconds=60)
+    def fetch(symbol):
+        calls.append(symbol)
+        return {"symbol": symbol}
+
+    assert fetch("BTCUSDT") == {"symbol": "BTCUSDT"}
+    assert fetch("BTCUSDT") == {"symbol": "BTCUSDT"}
+    assert fetch("ETHUSDT") == {"symbol": "ETHUSDT"}
+    assert calls == ["BTCUSDT", "ETHUSDT"]
+    assert len(list(tmp_path.glob("fetch_*.pkl"))) == 2
+
+
+def test_disk_cache_refetches_after_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    calls = []
+
+    @disk_cache(ttl_seconds=0)
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert fetch() == 1
+    assert fetch() == 2
+
+
+def test_cache_result_evicts_least_recently_used():
+    cache.clear()
+    calls = []
+
+    @cache.cache_result(ttl_minutes=5, maxsize=2)
+    def fetch(symbol):
+        calls.append(symbol)
+        return symbol
+
+    fetch("BTC")
+    fetch("ETH")
+    fetch("BTC")  # hit; ETH is now the oldest entry
+    fetch("SOL")  # evicts ETH
+    fetch("BTC")
+    fetch("ETH")
+
+    assert calls == ["BTC", "ETH", "SOL", "ETH"]
+
+
+def test_cache_result_clear_forces_refetch():
+    calls = []
+
+    @cache.cache_result(ttl_minutes=5)
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert fetch() == 1
+    assert fetch() == 1
+    cache.clear()
+    assert fetch() == 2
@@ -0,0 +1,20 @@
+from core.logger import DBLogger
+
+
+def test_close_positions_updates_only_given_ids(tmp_path):
+    db = DBLogger(f"sqlite:///{tmp_path / 'trading.db'}")
+    first = db.open_position("BTC/USD", 100.0, 1.0)
+    second = db.open_position("ETH/USD", 50.0, 2.0)
+    untouched = db.open_position("SOL/USD", 10.0, 3.0)
+
+    db.close_positions([(first, 95.5), (second, 48.25)])
+
+    positions = {row["id"]: row for row in db.get_open_positions()}
+    assert list(positions) == [untouched]
+
+    with db.engine.connect() as conn:
+        rows = conn.execute(
+            db.positions_table.select().where(db.positions_table.c.id.in_([first, second]))
+        ).mappings().all()
+    assert {row["id"]: float(row["exit_price"]) for row in rows} == {first: 95.5, second: 48.25}
+    assert all(row["status"] == "closed" and row["exit_time"] is not None for row in rows)
@@ -0,0 +1,37 @@
+import math
+
+from sentiment.core.normalizer import normalize, normalize_array, normalize_factors
+
+
+def test_normalize_array_matches_scalar():
+    values = [-1.0, 0.0, 0.01, 0.025, 0.05, 1.0]
+    scores = normalize_array(values, 0, 0.05)
+    for value, score in zip(values, scores):
+        assert math.isclose(score, normalize(value, 0, 0.05))
+
+
+def test_normalize_array_missing_values_are_neutral():
+    scores = normalize_array([None, float("nan"), 0.0], 0, 0.05)
+    assert scores.tolist() == [50.0, 50.0, 0.0]
+
+
+def test_normalize_factors_scores_each_symbol():
+    factors = {
+        "BTC/USD": {
+            "volatility_raw": 0.025,
+            "momentum_raw": 0.0,
+            "volume_raw": 1.5,
+            "marketcap_raw": 500000000000,
+            "btcdom_raw": None,
+        },
+    }
+
+    scores = normalize_factors(factors)["BTC/USD"]
+
+    assert scores == {
+        "volatility_score": 50.0,
+        "momentum_score": 50.0,
+        "volume_score": 100.0,
+        "marketcap_score": 0.0,
+        "btcdom_score": 50.0,
+    }
@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from sentiment.core.processor import process_all_factors
+
+
+def _sample_ohlc(bars=60, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, bars).cumsum()
+    return [
+        {
+            "timestamp": i,
+            "open": float(c),
+            "high": float(c + rng.uniform(0, 2)),
+            "low": float(c - rng.uniform(0, 2)),
+            "close": float(c),
+            "volume": float(rng.uniform(10, 100)),
+        }
+        for i, c in enumerate(close)
+    ]
+
+
+def _reference_factors(ohlc):
+    df = pd.DataFrame(ohlc)
+    tr = pd.concat(
+        [
+            df["high"] - df["low"],
+            (df["high"] - df["close"].shift()).abs(),
+            (df["low"] - df["close"].shift()).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    atr = tr.rolling(window=14).mean().iloc[-1] / df["close"].iloc[-1]
+
+    macd = (
+        df["close"].ewm(span=12, adjust=False).mean()
+        - df["close"].ewm(span=26, adjust=False).mean()
+    )
+    hist = (macd - macd.ewm(span=9, adjust=False).mean()).iloc[-1]
+
+    volume_ratio = df["volume"].iloc[-1] / df["volume"].tail(30).mean()
+    return atr, hist, volume_ratio
+
+
+def test_process_all_factors_matches_pandas_reference():
+    ohlc = _sample_ohlc()
+    market_data = {
+        "BTC/USD": {"ohlc": ohlc},
+        "CMC": {"total_market_cap_usd": 2e12, "btc_dominance": 55.0},
+    }
+
+    factors = process_all_factors(market_data)["BTC/USD"]
+    atr, hist, volume_ratio = _reference_factors(ohlc)
+
+    assert math.isclose(factors["volatility_raw"], atr, rel_tol=1e-9)
+    assert math.isclose(factors["momentum_raw"], hist, rel_tol=1e-9, abs_tol=1e-12)
+    assert math.isclose(factors["volume_raw"], volume_ratio, rel_tol=1e-9)
+    assert factors["marketcap_raw"] == 2e12
+    assert factors["btcdom_raw"] == 55.0
+
+
+def test_process_all_factors_short_history_has_no_atr():
+    factors = process_all_factors({"BTC/USD": {"ohlc": _sample_ohlc(bars=10)}})
+    assert math.isnan(factors["BTC/USD"]["volatility_raw"])
+
+
+def test_process_all_factors_handles_mixed_history_lengths():
+    market_data = {
+        "BTC/USD": {"ohlc": _sample_ohlc(bars=60, seed=1)},
+        "ETH/USD": {"ohlc": _sample_ohlc(bars=45, seed=2)},
+        "DOGE/USD": {"ohlc": _sample_ohlc(bars=60, seed=3)},
+    }
+
+    factors = process_all_factors(market_data)
+
+    assert list(factors) == ["BTC/USD", "ETH/USD", "DOGE/USD"]
+    for symbol, data in market_data.items():
+        atr, hist, volume_ratio = _reference_factors(data["ohlc"])
+        assert math.isclose(factors[symbol]["volatility_raw"], atr, rel_tol=1e-9)
+        assert math.isclose(factors[symbol]["momentum_raw"], hist, rel_tol=1e-9, abs_tol=1e-12)
+        assert math.isclose(factors[symbol]["volume_raw"], volume_ratio, rel_tol=1e-9)
+
+
+def test_process_all_factors_accepts_column_arrays():
+    ohlc = _sample_ohlc(bars=60, seed=4)
+    columns = {key: np.array([candle[key] for candle in ohlc]) for key in ohlc[0]}
+
+    from_rows = process_all_factors({"BTC/USD": {"ohlc": ohlc}})
+    from_columns = process_all_factors({"BTC/USD": {"ohlc": columns}})
+
+    assert from_columns == from_rows
@@ -0,0 +1,53 @@
+import math
+
+from sentiment.core.scorer import calculate_final_score
+
+FACTORS = {
+    "BTC/USD": {
+        "volatility_score": 10,
+        "momentum_score": 20,
+        "volume_score": 30,
+        "marketcap_score": 40,
+        "btcdom_score": 50,
+    },
+    "ETH/USD": {
+        "volatility_score": 100,
+        "momentum_score": 0,
+        "volume_score": 0,
+        "marketcap_score": 0,
+        "btcdom_score": 0,
+    },
+}
+
+
+def test_calculate_final_score_uses_default_weights():
+    scores = calculate_final_score(FACTORS, "sideways")
+
+    assert math.isclose(scores["BTC/USD"], 10 * 0.25 + 20 * 0.2 + 30 * 0.2 + 40 * 0.2 + 50 * 0.15)
+    assert math.isclose(scores["ETH/USD"], 25.0)
+
+
+def test_calculate_final_score_reads_weights_and_emotions(monkeypatch):
+    monkeypatch.setenv("WEIGHT_VOLATILITY", "0.5")
+    emotional = {"funding_rate_score": 100, "long_short_score": 0, "taker_volume_score": 0}
+
+    scores = calculate_final_score(FACTORS, "sideways", emotional)
+
+    assert math.isclose(scores["ETH/USD"], 100 * 0.5 + 100 * 0.05)
+
+
+def test_calculate_final_score_large_batches_match_specialized_path():
+    many = {f"SYM{i}/USD": FACTORS["BTC/USD"] for i in range(40)}
+
+    batch = calculate_final_score(many, "sideways")
+    single = calculate_final_score({"BTC/USD": FACTORS["BTC/USD"]}, "sideways")
+
+    assert all(math.isclose(score, single["BTC/USD"]) for score in batch.values())
+
+
+def test_calculate_final_score_handles_non_finite_weights(monkeypatch):
+    monkeypatch.setenv("WEIGHT_VOLATILITY", "1e400")
+
+    scores = calculate_final_score(FACTORS, "sideways")
+
+    assert math.isinf(scores["BTC/USD"])
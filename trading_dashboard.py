@@ -5,12 +5,15 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import pytz
-from functools import lru_cache
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit_autorefresh import st_autorefresh
 import hmac
 import hashlib
 import base64
@@ -27,7 +30,8 @@ CACHE_TTL = 300  # 5 minutes cache for database queries
 # Database and API Configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
 KRAKEN_API_KEY = os.getenv('KRAKEN_API_KEY')
-KRAKEN_API_SECRET = os.getenv('KRAKEN_API_SECRET').encode()
+# Decoded once here; signing only needs the raw key bytes
+KRAKEN_API_SECRET = base64.b64decode(os.getenv('KRAKEN_API_SECRET'))
 
 # Symbol mapping (adjust based on your trading pairs)
 SYMBOLS_MAPPING = {
@@ -37,9 +41,18 @@ SYMBOLS_MAPPING = {
 }
 
 # Database Connection Helper
+@st.cache_resource
 def create_db_connection():
     try:
-        engine = create_engine(DATABASE_URL)
+        # Created once per process (cache_resource); keep a small warm pool
+        # and drop connections the server has closed between refreshes
+        engine = create_engine(
+            DATABASE_URL,
+            pool_size=5,
+            max_overflow=5,
+            pool_pre_ping=True,
+            future=True
+        )
         return engine
     except Exception as e:
         st.error(f"Database connection error: {e}")
@@ -47,35 +60,34 @@ def create_db_connection():
 
 # Kraken API Authentication
 def get_kraken_signature(urlpath, data, secret):
+    """Sign a private request; secret is the already base64-decoded API secret"""
     postdata = urllib.parse.urlencode(data)
     encoded = (str(data['nonce']) + postdata).encode()
     message = urlpath.encode() + hashlib.sha256(encoded).digest()
-    mac = hmac.new(base64.b64decode(secret), message, hashlib.sha512)
+    mac = hmac.new(secret, message, hashlib.sha512)
     sigdigest = base64.b64encode(mac.digest())
     return sigdigest.decode()
 
+# Shared keep-alive session for every Kraken call
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def kraken_request(uri_path, data):
+    """Signed request for /0/private/* endpoints"""
     headers = {
         'API-Key': KRAKEN_API_KEY,
         'API-Sign': get_kraken_signature(uri_path, data, KRAKEN_API_SECRET)
     }
-    response = requests.post(f"https://api.kraken.com{uri_path}", headers=headers, data=data)
+    response = _session.post(f"https://api.kraken.com{uri_path}", headers=headers, data=data, timeout=5)
     return response.json()
 
-# Data Fetching Functions with Caching
-@lru_cache(maxsize=32, typed=False)
-def get_cached_data(query_name, *args):
-    """Generic caching function for database queries"""
-    if query_name == "open_positions":
-        return fetch_open_positions()
-    elif query_name == "portfolio_allocation":
-        return fetch_portfolio_allocation()
-    elif query_name == "cumulative_pnl":
-        return fetch_cumulative_pnl()
-    elif query_name == "todays_trades":
-        return fetch_todays_trades()
-    return None
+def kraken_public(uri_path, params):
+    """Unsigned GET for /0/public/* endpoints"""
+    response = _session.get(f"https://api.kraken.com{uri_path}", params=params, timeout=5)
+    return response.json()
 
+# Data Fetching Functions with Caching
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_open_positions():
     engine = create_db_connection()
     if not engine:
@@ -92,39 +104,50 @@ def fetch_open_positions():
         with engine.connect() as connection:
             df = pd.read_sql(query, connection)
         
-        # Get current prices from Kraken
-        df['current_price'] = df['symbol'].apply(get_current_price)
-        df['unrealized_pnl'] = (df['current_price'] - df['entry_price']) * df['volume']
+        # DECIMAL columns arrive as Python Decimals (object dtype); cast once
+        # so the PnL math runs on float64 arrays
+        df = df.astype({'symbol': 'category', 'entry_price': 'float64', 'volume': 'float64'})
+        
+        # Get current prices from Kraken in one Ticker call
+        prices = get_current_prices(df['symbol'].cat.categories)
+        df['current_price'] = df['symbol'].map(prices).astype('float64').fillna(0)
+        df['unrealized_pnl'] = np.subtract(
+            df['current_price'].to_numpy(), df['entry_price'].to_numpy()
+        ) * df['volume'].to_numpy()
         return df
     except Exception as e:
         st.error(f"Error fetching open positions: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_portfolio_allocation():
     engine = create_db_connection()
     if not engine:
         return pd.DataFrame()
     
+    # Each asset's share of the total comes from a window over the grouped sums
     query = text("""
     SELECT 
         asset, 
-        SUM(value_usd) as value
+        SUM(value_usd) as value,
+        100.0 * SUM(value_usd) / NULLIF(SUM(SUM(value_usd)) OVER (), 0) as percentage
     FROM portfolio_allocation
     GROUP BY asset
     """)
     
     try:
         with engine.connect() as connection:
-            df = pd.read_sql(query, connection)
-        
-        # Calculate percentages
-        total_value = df['value'].sum()
-        df['percentage'] = (df['value'] / total_value) * 100
+            df = pd.read_sql(
+                query,
+                connection,
+                dtype={'asset': 'category', 'value': 'float64', 'percentage': 'float64'}
+            )
         return df
     except Exception as e:
         st.error(f"Error fetching portfolio allocation: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_cumulative_pnl():
     engine = create_db_connection()
     if not engine:
@@ -133,7 +156,8 @@ def fetch_cumulative_pnl():
     query = text("""
     SELECT 
         date, 
-        SUM(pnl) as pnl
+        SUM(pnl) as pnl,
+        SUM(SUM(pnl)) OVER (ORDER BY date) as cumulative_pnl
     FROM trades
     GROUP BY date
     ORDER BY date
@@ -142,56 +166,52 @@ def fetch_cumulative_pnl():
     try:
         with engine.connect() as connection:
             df = pd.read_sql(query, connection)
-        df['cumulative_pnl'] = df['pnl'].cumsum()
         return df
     except Exception as e:
         st.error(f"Error fetching cumulative PnL: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def fetch_todays_trades():
     engine = create_db_connection()
     if not engine:
         return pd.DataFrame()
     
-    today = datetime.now().strftime('%Y-%m-%d')
-    query = text(f"""
+    query = text("""
     SELECT 
         time, symbol, side, price, quantity, pnl
     FROM trades
-    WHERE date = :today
+    WHERE date = CURRENT_DATE
     ORDER BY time DESC
     LIMIT 20
     """)
     
     try:
         with engine.connect() as connection:
-            df = pd.read_sql(query, connection, params={'today': today})
+            df = pd.read_sql(query, connection)
         return df
     except Exception as e:
         st.error(f"Error fetching today's trades: {e}")
         return pd.DataFrame()
 
-def get_current_price(symbol):
-    """Fetch current price from Kraken API"""
-    kraken_symbol = SYMBOLS_MAPPING.get(symbol)
-    if not kraken_symbol:
-        return 0
+def get_current_prices(symbols):
+    """Fetch current prices for several symbols with a single Kraken Ticker call"""
+    kraken_symbols = {SYMBOLS_MAPPING[symbol]: symbol for symbol in symbols if symbol in SYMBOLS_MAPPING}
+    prices = {symbol: 0 for symbol in symbols}
+    if not kraken_symbols:
+        return prices
     
     try:
-        # Using authenticated request for more reliable data
-        nonce = str(int(time.time() * 1000))
-        data = {
-            'nonce': nonce,
-            'pair': kraken_symbol
-        }
-        response = kraken_request('/0/public/Ticker', data)
+        # Ticker is a public endpoint and accepts a comma-separated pair list
+        response = kraken_public('/0/public/Ticker', {'pair': ','.join(kraken_symbols)})
         
-        if 'result' in response and kraken_symbol in response['result']:
-            return float(response['result'][kraken_symbol]['c'][0])
-        return 0
+        for kraken_symbol, ticker in response.get('result', {}).items():
+            if kraken_symbol in kraken_symbols:
+                prices[kraken_symbols[kraken_symbol]] = float(ticker['c'][0])
+        return prices
     except Exception as e:
-        st.error(f"Error fetching price for {symbol}: {e}")
-        return 0
+        st.error(f"Error fetching prices for {', '.join(symbols)}: {e}")
+        return prices
 
 def fetch_ohlc_data(symbol='BTC/USD', interval=15, since=None):
     """Fetch OHLC data from Kraken API"""
@@ -200,16 +220,14 @@ def fetch_ohlc_data(symbol='BTC/USD', interval=15, since=None):
         return pd.DataFrame()
     
     try:
-        nonce = str(int(time.time() * 1000))
-        data = {
-            'nonce': nonce,
+        params = {
             'pair': kraken_symbol,
             'interval': interval
         }
         if since:
-            data['since'] = since
+            params['since'] = since
             
-        response = kraken_request('/0/public/OHLC', data)
+        response = kraken_public('/0/public/OHLC', params)
         
         if 'result' in response and kraken_symbol in response['result']:
             ohlc_data = response['result'][kraken_symbol]
@@ -217,6 +235,17 @@ def fetch_ohlc_data(symbol='BTC/USD', interval=15, since=None):
                 'time', 'open', 'high', 'low', 'close', 
                 'vwap', 'volume', 'count'
             ])
+            # Kraken sends prices as strings; type every column once here
+            df = df.astype({
+                'time': 'int64',
+                'open': 'float64',
+                'high': 'float64',
+                'low': 'float64',
+                'close': 'float64',
+                'vwap': 'float64',
+                'volume': 'float64',
+                'count': 'int64'
+            })
             df['time'] = pd.to_datetime(df['time'], unit='s')
             df['symbol'] = symbol
             return df
@@ -231,40 +260,52 @@ def calculate_risk_metrics():
     if not engine:
         return {}
     
+    # Running PnL, its peak and the aggregates all computed by the database,
+    # which returns a single row (CASE rather than FILTER keeps it portable)
     query = text("""
+    WITH ordered AS (
+        SELECT 
+            pnl,
+            ROW_NUMBER() OVER (ORDER BY exit_time, entry_time) AS seq
+        FROM trades
+        WHERE pnl IS NOT NULL
+    ), running AS (
+        SELECT 
+            pnl,
+            seq,
+            SUM(pnl) OVER (ORDER BY seq ROWS UNBOUNDED PRECEDING) AS cumulative_pnl
+        FROM ordered
+    ), drawdowns AS (
+        SELECT 
+            pnl,
+            cumulative_pnl - MAX(cumulative_pnl) OVER (ORDER BY seq ROWS UNBOUNDED PRECEDING) AS drawdown
+        FROM running
+    )
     SELECT 
-        pnl, 
-        entry_time,
-        exit_time
-    FROM trades
-    WHERE pnl IS NOT NULL
+        COUNT(*) AS trade_count,
+        MIN(drawdown) AS max_drawdown,
+        AVG(CASE WHEN pnl > 0 THEN pnl END) AS avg_win,
+        AVG(CASE WHEN pnl < 0 THEN pnl END) AS avg_loss,
+        AVG(CASE WHEN pnl > 0 THEN 1.0 ELSE 0.0 END) AS win_rate
+    FROM drawdowns
     """)
     
     try:
         with engine.connect() as connection:
-            df = pd.read_sql(query, connection)
+            row = connection.execute(query).mappings().first()
         
-        if df.empty:
+        if not row or not row['trade_count']:
             return {}
         
-        # Calculate max drawdown
-        df['cumulative_pnl'] = df['pnl'].cumsum()
-        df['peak'] = df['cumulative_pnl'].cummax()
-        df['drawdown'] = df['cumulative_pnl'] - df['peak']
-        max_drawdown = df['drawdown'].min()
-        
         # Calculate risk/reward ratio
-        avg_win = df[df['pnl'] > 0]['pnl'].mean()
-        avg_loss = abs(df[df['pnl'] < 0]['pnl'].mean())
+        avg_win = float(row['avg_win'] or 0)
+        avg_loss = abs(float(row['avg_loss'] or 0))
         risk_reward = avg_win / avg_loss if avg_loss != 0 else 0
         
-        # Calculate win rate
-        win_rate = len(df[df['pnl'] > 0]) / len(df)
-        
         return {
-            'max_drawdown': max_drawdown,
+            'max_drawdown': float(row['max_drawdown']),
             'risk_reward': risk_reward,
-            'win_rate': win_rate
+            'win_rate': float(row['win_rate'])
         }
     except Exception as e:
         st.error(f"Error calculating risk metrics: {e}")
@@ -272,7 +313,8 @@ def calculate_risk_metrics():
 
 # Dashboard Layout
 def main():
-    # Auto-refresh logic
+    # Auto-refresh logic: the browser schedules the rerun, no server thread sleeps
+    st_autorefresh(interval=REFRESH_INTERVAL * 1000, key="dash_refresh")
     last_refresh = st.empty()
     
     # Header
@@ -286,14 +328,35 @@ def main():
     # KPI Strip
     st.markdown("---")
     
-    # Calculate KPIs
-    risk_metrics = calculate_risk_metrics()
-    cumulative_pnl = get_cached_data("cumulative_pnl")
+    # Calculate KPIs; the fetches are independent I/O, so run them side by side
+    # (workers get this run's context so st.error/st.cache_* keep working)
+    # The chart's symbol comes from the selectbox's session state, so its
+    # candles can be fetched alongside everything else
+    ctx = get_script_run_ctx()
+    chart_symbol = st.session_state.get("ohlc_symbol", next(iter(SYMBOLS_MAPPING)))
+    with ThreadPoolExecutor(
+        max_workers=6,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = {
+            name: executor.submit(fn)
+            for name, fn in [
+                ("risk_metrics", calculate_risk_metrics),
+                ("cumulative_pnl", fetch_cumulative_pnl),
+                ("open_positions", fetch_open_positions),
+                ("todays_trades", fetch_todays_trades),
+                ("portfolio_allocation", fetch_portfolio_allocation),
+                ("ohlc", lambda: fetch_ohlc_data(symbol=chart_symbol)),
+            ]
+        }
+    
+    risk_metrics = futures["risk_metrics"].result()
+    cumulative_pnl = futures["cumulative_pnl"].result()
     total_pnl = cumulative_pnl['cumulative_pnl'].iloc[-1] if not cumulative_pnl.empty else 0
-    open_positions = get_cached_data("open_positions")
+    open_positions = futures["open_positions"].result()
     unrealized_pnl = open_positions['unrealized_pnl'].sum() if not open_positions.empty else 0
     win_rate = risk_metrics.get('win_rate', 0)
-    todays_trades = get_cached_data("todays_trades")
+    todays_trades = futures["todays_trades"].result()
     trades_today = len(todays_trades) if todays_trades is not None else 0
     
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
@@ -331,7 +394,7 @@ def main():
     with col2:
         # Portfolio Allocation Pie
         st.subheader("Portfolio Allocation")
-        portfolio_data = get_cached_data("portfolio_allocation")
+        portfolio_data = futures["portfolio_allocation"].result()
         if not portfolio_data.empty:
             fig = px.pie(portfolio_data, values='percentage', names='asset')
             st.plotly_chart(fig, use_container_width=True)
@@ -360,15 +423,18 @@ def main():
     
     # Candlestick Chart
     st.subheader("Price Action")
-    symbol_to_display = st.selectbox("Select Symbol", list(SYMBOLS_MAPPING.keys()))
-    ohlc_data = fetch_ohlc_data(symbol=symbol_to_display)
+    symbol_to_display = st.selectbox("Select Symbol", list(SYMBOLS_MAPPING.keys()), key="ohlc_symbol")
+    if symbol_to_display == chart_symbol:
+        ohlc_data = futures["ohlc"].result()
+    else:
+        ohlc_data = fetch_ohlc_data(symbol=symbol_to_display)
     if not ohlc_data.empty:
         fig = go.Figure(data=[go.Candlestick(
             x=ohlc_data['time'],
-            open=ohlc_data['open'].astype(float),
-            high=ohlc_data['high'].astype(float),
-            low=ohlc_data['low'].astype(float),
-            close=ohlc_data['close'].astype(float)
+            open=ohlc_data['open'],
+            high=ohlc_data['high'],
+            low=ohlc_data['low'],
+            close=ohlc_data['close']
         )])
         st.plotly_chart(fig, use_container_width=True)
     else:
@@ -383,10 +449,6 @@ def main():
     # Footer
     st.markdown("---")
     st.caption(f"Dashboard v2.1 | Data as of {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Auto-refresh
-    time.sleep(REFRESH_INTERVAL)
-    st.experimental_rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,12 +3,28 @@
 import os
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 TOKEN = os.getenv("PUSHOVER_API_TOKEN")
 USER  = os.getenv("PUSHOVER_USER_KEY")
 API_URL = "https://api.pushover.net/1/messages.json"
 
+# Keep the TLS connection to Pushover open between notifications; retry
+# rate limits and transient server errors with a short backoff
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+    ),
+))
+
 def notify(title: str, message: str):
     """
     Send a Pushover notification via direct HTTP.
@@ -19,5 +35,5 @@ def notify(title: str, message: str):
         "title":   title,
         "message": message,
     }
-    resp = requests.post(API_URL, data=payload, timeout=10)
+    resp = _session.post(API_URL, data=payload, timeout=10)
     resp.raise_for_status()